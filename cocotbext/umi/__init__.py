@@ -1,5 +1,5 @@
 # Version number
-__version__ = "0.0.3"
+__version__ = "0.0.4"
 
 # Sub-modules
 from . import sumi, tumi
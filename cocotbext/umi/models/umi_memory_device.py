@@ -1,16 +1,24 @@
-import copy
-
 from cocotbext.umi.sumi import SumiCmd, SumiCmdType, SumiTransaction
 from cocotbext.umi.tumi import TumiTransaction
 from cocotbext.umi.drivers.sumi_driver import SumiDriver
 from cocotbext.umi.monitors.sumi_monitor import SumiMonitor
 
 
+PAGE_BITS = 12
+PAGE_SIZE = 1 << PAGE_BITS
+
+# Opcode bits of a packed command header
+OPCODE_MASK = ((1 << SumiCmd.cmd_type.width) - 1) << SumiCmd.cmd_type.lsb_idx
+
+
 class UmiMemoryDevice:
     """
     Virtual memory device that responds to UMI read/write requests.
 
     Uses a SumiMonitor to receive requests and a SumiDriver to send responses.
+
+    Memory is stored sparsely as a map of PAGE_SIZE byte pages, allocated
+    on first write. Unwritten addresses read back as zero.
     """
 
     def __init__(
@@ -22,11 +30,14 @@ class UmiMemoryDevice:
         self.monitor = monitor
         self.driver = driver
         self.log = log
-        self.memory: dict[int, int] = {}
+        self.pages: dict[int, bytearray] = {}
 
         self.dw = self.driver.get_bus_width()
         self.aw = self.driver.get_addr_width()
 
+        # Packed header template for read responses, size/len/eom are set per fragment
+        self._resp_read_cmd = int(SumiCmd.from_fields(cmd_type=SumiCmdType.UMI_RESP_READ))
+
         self.monitor.add_callback(self._on_transaction)
 
     def _on_transaction(self, transaction: SumiTransaction):
@@ -55,12 +66,13 @@ class UmiMemoryDevice:
                 f"data={data[:data_size].hex()}"
             )
 
-        for i in range(data_size):
-            self.memory[dstaddr + i] = data[i]
+        self._write_bytes(dstaddr, memoryview(data)[:data_size])
 
         if send_response:
-            resp_cmd = copy.deepcopy(transaction.cmd)
-            resp_cmd.cmd_type.from_int(SumiCmdType.UMI_RESP_WRITE)
+            # Write ack mirrors the request header with the opcode replaced
+            resp_cmd = SumiCmd.from_int(
+                (int(transaction.cmd) & ~OPCODE_MASK) | SumiCmdType.UMI_RESP_WRITE
+            )
             resp = SumiTransaction(
                 cmd=resp_cmd,
                 da=int(transaction.sa),
@@ -75,7 +87,7 @@ class UmiMemoryDevice:
         srcaddr = int(transaction.da)
         data_size = transaction.cmd.total_bytes()
 
-        data = bytes(self.memory.get(srcaddr + i, 0) for i in range(data_size))
+        data = self._read_bytes(srcaddr, data_size)
 
         if self.log:
             self.log.info(
@@ -84,9 +96,7 @@ class UmiMemoryDevice:
             )
 
         tumi_trans = TumiTransaction(
-            cmd=SumiCmd.from_fields(
-                cmd_type=SumiCmdType.UMI_RESP_READ
-            ),
+            cmd=SumiCmd.from_int(self._resp_read_cmd),
             da=int(transaction.sa),
             sa=int(transaction.da),
             data=data
@@ -94,19 +104,55 @@ class UmiMemoryDevice:
         for sumi_trans in tumi_trans.to_sumi(data_bus_size=self.dw//8, addr_width=self.aw):
             self.driver.append(sumi_trans)
 
+    def _write_bytes(self, address: int, data: bytes):
+        """Store data into the page map, allocating pages as needed."""
+        data_view = memoryview(data)
+        pos = 0
+        size = len(data_view)
+        while pos < size:
+            pno, off = divmod(address + pos, PAGE_SIZE)
+            n = min(PAGE_SIZE - off, size - pos)
+            page = self.pages.get(pno)
+            if page is None:
+                page = self.pages[pno] = bytearray(PAGE_SIZE)
+            memoryview(page)[off:off + n] = data_view[pos:pos + n]
+            pos += n
+
+    def _read_bytes(self, address: int, length: int) -> bytes:
+        """Load data from the page map, returning zeros for absent pages."""
+        out = bytearray(length)
+        out_view = memoryview(out)
+        pos = 0
+        while pos < length:
+            pno, off = divmod(address + pos, PAGE_SIZE)
+            n = min(PAGE_SIZE - off, length - pos)
+            page = self.pages.get(pno)
+            if page is not None:
+                out_view[pos:pos + n] = memoryview(page)[off:off + n]
+            pos += n
+        return bytes(out)
+
     def read(self, address: int, length: int = 1) -> bytes:
         """Read bytes from virtual memory directly."""
-        return bytes(self.memory.get(address + i, 0) for i in range(length))
+        return self._read_bytes(address, length)
 
     def write(self, address: int, data: bytes):
         """Write bytes to virtual memory directly (for test setup)."""
-        for i, byte in enumerate(data):
-            self.memory[address + i] = byte
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+        self._write_bytes(address, data)
 
     def dump_memory(self) -> list[tuple[int, int]]:
-        """Return a sorted list of (address, value) tuples."""
-        return sorted(self.memory.items())
+        """Return a sorted list of (address, value) tuples for non-zero bytes."""
+        rtn = []
+        for pno in sorted(self.pages):
+            base = pno << PAGE_BITS
+            rtn.extend(
+                (base + off, value)
+                for off, value in enumerate(self.pages[pno]) if value
+            )
+        return rtn
 
     def clear(self):
         """Clear all memory contents."""
-        self.memory.clear()
+        self.pages.clear()
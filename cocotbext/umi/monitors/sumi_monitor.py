@@ -1,3 +1,5 @@
+import functools
+
 from cocotb.types import LogicArray
 from cocotb.triggers import RisingEdge
 
@@ -22,6 +24,7 @@ class SumiMonitor(BusMonitor):
         BusMonitor.__init__(self, entity, name, clock, **kwargs)
         self.addr_width = len(self.bus.dstaddr)
         self.data_width = len(self.bus.data)
+        self.data_nbytes = self.data_width // 8
 
     def get_bus_width(self) -> int:
         return self.data_width
@@ -29,11 +32,27 @@ class SumiMonitor(BusMonitor):
     def get_addr_width(self) -> int:
         return self.addr_width
 
+    @staticmethod
+    def _decode_data(raw: LogicArray, bus_nbytes: int, nbytes: int):
+        if raw.is_resolvable:
+            return int(raw).to_bytes(bus_nbytes, byteorder="little")[:nbytes]
+        # Unused upper lanes may be unresolved, only check the payload bits
+        raw = raw[nbytes * 8 - 1:0]
+        return int(raw).to_bytes(nbytes, byteorder="little") if raw.is_resolvable else None
+
     async def _monitor_recv(self):
         clk_re = RisingEdge(self.clock)
 
-        def valid_handshake() -> bool:
-            return bool(self.bus.valid.value) and bool(self.bus.ready.value)
+        valid = self.bus.valid
+        ready = self.bus.ready
+        cmd = self.bus.cmd
+        dstaddr = self.bus.dstaddr
+        srcaddr = self.bus.srcaddr
+        data = self.bus.data
+
+        data_nbytes = self.data_nbytes
+        addr_width = self.addr_width
+        decode_data = self._decode_data
 
         while True:
             await clk_re
@@ -41,28 +60,24 @@ class SumiMonitor(BusMonitor):
             if self.in_reset:
                 continue
 
-            if valid_handshake():
-                sumi_cmd: SumiCmd = SumiCmd.from_int(int(self.bus.cmd.value))
+            if bool(valid.value) and bool(ready.value):
+                sumi_cmd: SumiCmd = SumiCmd.from_int(int(cmd.value))
 
-                # Only slice data if the command type carries data
+                # Only capture data if the command type carries data, conversion
+                # to bytes is deferred until a consumer reads transaction.data
                 if sumi_cmd.has_data():
-                    data: LogicArray = self.bus.data.value
-                    # Limit slice to actual data size, but don't exceed bus width
-                    data_bits = min(
-                        (((int(sumi_cmd.len) + 1) << int(sumi_cmd.size)) * 8),
-                        self.data_width
-                    )
-                    data = data[data_bits - 1:0]
-                    data_bytes = data.to_bytes(byteorder="little") if data.is_resolvable else None
+                    # Limit to actual data size, but don't exceed bus width
+                    nbytes = min(sumi_cmd.total_bytes(), data_nbytes)
+                    data_loader = functools.partial(decode_data, data.value, data_nbytes, nbytes)
                 else:
-                    data_bytes = None
+                    data_loader = None
 
-                self._recv(SumiTransaction(
+                da = dstaddr.value
+                sa = srcaddr.value
+                self._recv(SumiTransaction.with_lazy_data(
                     cmd=sumi_cmd,
-                    da=int(self.bus.dstaddr.value) if self.bus.dstaddr.value.is_resolvable
-                    else None,
-                    sa=int(self.bus.srcaddr.value) if self.bus.srcaddr.value.is_resolvable
-                    else None,
-                    data=data_bytes,
-                    addr_width=self.addr_width
+                    da=int(da) if da.is_resolvable else None,
+                    sa=int(sa) if sa.is_resolvable else None,
+                    data_loader=data_loader,
+                    addr_width=addr_width
                 ))
@@ -1,9 +1,8 @@
 from enum import IntEnum
-from typing import Optional
-import dataclasses
-import copy
+from typing import Callable, Optional
+import struct
 
-from cocotbext.umi.utils.bit_utils import BitField, BitVector
+from cocotbext.umi.utils.bit_utils import BitField, PackedField
 from cocotbext.umi.utils.vrd_transaction import VRDTransaction
 
 
@@ -35,67 +34,98 @@ class SumiCmdType(IntEnum):
     @classmethod
     def supports_streaming(cls, value):
         """Check if the command type supports streaming (multiple data transfers)."""
-        return value in [
-            SumiCmdType.UMI_REQ_WRITE,
-            SumiCmdType.UMI_REQ_POSTED,
-            SumiCmdType.UMI_RESP_READ
-        ]
+        return _opcode_in(_STREAM_MASK, value)
 
     @classmethod
     def is_request(cls, value):
         """Check if the command is a request (host -> device)."""
-        return value in [
-            SumiCmdType.UMI_REQ_READ,
-            SumiCmdType.UMI_REQ_WRITE,
-            SumiCmdType.UMI_REQ_POSTED,
-            SumiCmdType.UMI_REQ_RDMA,
-            SumiCmdType.UMI_REQ_ATOMIC,
-            SumiCmdType.UMI_REQ_USER0,
-            SumiCmdType.UMI_REQ_FUTURE0,
-            SumiCmdType.UMI_REQ_ERROR,
-            SumiCmdType.UMI_REQ_LINK,
-        ]
+        return _opcode_in(_IS_REQ_MASK, value)
 
     @classmethod
     def is_response(cls, value):
         """Check if the command is a response (device -> host)."""
-        return value in [
-            SumiCmdType.UMI_RESP_READ,
-            SumiCmdType.UMI_RESP_WRITE,
-            SumiCmdType.UMI_RESP_USER0,
-            SumiCmdType.UMI_RESP_USER1,
-            SumiCmdType.UMI_RESP_FUTURE0,
-            SumiCmdType.UMI_RESP_FUTURE1,
-            SumiCmdType.UMI_RESP_LINK,
-        ]
+        return _opcode_in(_IS_RESP_MASK, value)
 
     @classmethod
     def has_data(cls, value):
         """Check if the command type carries data."""
-        return value in [
-            SumiCmdType.UMI_REQ_WRITE,
-            SumiCmdType.UMI_REQ_POSTED,
-            SumiCmdType.UMI_REQ_ATOMIC,
-            SumiCmdType.UMI_REQ_USER0,
-            SumiCmdType.UMI_REQ_FUTURE0,
-            SumiCmdType.UMI_RESP_READ,
-            SumiCmdType.UMI_RESP_USER1,
-            SumiCmdType.UMI_RESP_FUTURE1,
-        ]
+        return _opcode_in(_HAS_DATA_MASK, value)
 
     @classmethod
     def has_source_addr(cls, value):
         """Check if the command type includes source address (SA)."""
-        return value in [
-            SumiCmdType.UMI_REQ_READ,
-            SumiCmdType.UMI_REQ_WRITE,
-            SumiCmdType.UMI_REQ_POSTED,
-            SumiCmdType.UMI_REQ_RDMA,
-            SumiCmdType.UMI_REQ_ATOMIC,
-            SumiCmdType.UMI_REQ_USER0,
-            SumiCmdType.UMI_REQ_FUTURE0,
-            SumiCmdType.UMI_REQ_ERROR,
-        ]
+        return _opcode_in(_HAS_SA_MASK, value)
+
+
+def _opcode_mask(*opcodes: SumiCmdType) -> int:
+    """Build a bitmask with one bit set per opcode."""
+    return sum(1 << int(opcode) for opcode in opcodes)
+
+
+def _opcode_in(mask: int, value) -> bool:
+    """Check if value is an opcode whose bit is set in mask, non-opcodes are never set."""
+    if not isinstance(value, int) or not 0 <= value < 64:
+        return False
+    return bool((mask >> value) & 1)
+
+
+_STREAM_MASK = _opcode_mask(
+    SumiCmdType.UMI_REQ_WRITE,
+    SumiCmdType.UMI_REQ_POSTED,
+    SumiCmdType.UMI_RESP_READ,
+)
+_IS_REQ_MASK = _opcode_mask(
+    SumiCmdType.UMI_REQ_READ,
+    SumiCmdType.UMI_REQ_WRITE,
+    SumiCmdType.UMI_REQ_POSTED,
+    SumiCmdType.UMI_REQ_RDMA,
+    SumiCmdType.UMI_REQ_ATOMIC,
+    SumiCmdType.UMI_REQ_USER0,
+    SumiCmdType.UMI_REQ_FUTURE0,
+    SumiCmdType.UMI_REQ_ERROR,
+    SumiCmdType.UMI_REQ_LINK,
+)
+_IS_RESP_MASK = _opcode_mask(
+    SumiCmdType.UMI_RESP_READ,
+    SumiCmdType.UMI_RESP_WRITE,
+    SumiCmdType.UMI_RESP_USER0,
+    SumiCmdType.UMI_RESP_USER1,
+    SumiCmdType.UMI_RESP_FUTURE0,
+    SumiCmdType.UMI_RESP_FUTURE1,
+    SumiCmdType.UMI_RESP_LINK,
+)
+_HAS_DATA_MASK = _opcode_mask(
+    SumiCmdType.UMI_REQ_WRITE,
+    SumiCmdType.UMI_REQ_POSTED,
+    SumiCmdType.UMI_REQ_ATOMIC,
+    SumiCmdType.UMI_REQ_USER0,
+    SumiCmdType.UMI_REQ_FUTURE0,
+    SumiCmdType.UMI_RESP_READ,
+    SumiCmdType.UMI_RESP_USER1,
+    SumiCmdType.UMI_RESP_FUTURE1,
+)
+_HAS_SA_MASK = _opcode_mask(
+    SumiCmdType.UMI_REQ_READ,
+    SumiCmdType.UMI_REQ_WRITE,
+    SumiCmdType.UMI_REQ_POSTED,
+    SumiCmdType.UMI_REQ_RDMA,
+    SumiCmdType.UMI_REQ_ATOMIC,
+    SumiCmdType.UMI_REQ_USER0,
+    SumiCmdType.UMI_REQ_FUTURE0,
+    SumiCmdType.UMI_REQ_ERROR,
+)
+
+
+def _opcode_table(mask: int) -> tuple[bool, ...]:
+    """Expand an opcode bitmask into a tuple indexed by opcode."""
+    return tuple(bool((mask >> op) & 1) for op in range(64))
+
+
+# Indexed by SumiCmd.cmd_type, which as an unsigned 5 bit field is always in range
+_IS_REQ = _opcode_table(_IS_REQ_MASK)
+_IS_RESP = _opcode_table(_IS_RESP_MASK)
+_HAS_DATA = _opcode_table(_HAS_DATA_MASK)
+_HAS_SA = _opcode_table(_HAS_SA_MASK)
 
 
 class SumiAtomicType(IntEnum):
@@ -143,8 +173,7 @@ class SumiSize(IntEnum):
         return 1 << self.value
 
 
-@dataclasses.dataclass
-class SumiCmd(BitVector):
+class SumiCmd:
     """
     UMI Command Header (32 bits)
 
@@ -160,161 +189,224 @@ class SumiCmd(BitVector):
         [24]    - ex: Exclusive access indicator
         [26:25] - u: User bits (for requests) or ERR (for responses)
         [31:27] - hostid: Host ID
+
+    The header is stored as a single packed integer, each field reads and
+    assigns as a plain int (e.g. ``cmd.size = 3``). FIELDS lists the field
+    names in bit order.
     """
 
     # Bits [4:0] - Command opcode
-    cmd_type: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=5, offset=0)
-    )
+    cmd_type = PackedField(width=5, offset=0)
 
     # Bits [7:5] - Word size (bytes per word = 2^SIZE)
-    size: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=3, offset=5)
-    )
+    size = PackedField(width=3, offset=5)
 
     # Bits [15:8] - Transfer count (LEN+1 words) or ATYPE for atomics
-    len: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=8, offset=8)
-    )
+    len = PackedField(width=8, offset=8)
 
     # Bits [19:16] - Quality of service
-    qos: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=4, offset=16)
-    )
+    qos = PackedField(width=4, offset=16)
 
     # Bits [21:20] - Protection mode
-    prot: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=2, offset=20)
-    )
+    prot = PackedField(width=2, offset=20)
 
     # Bit [22] - End of message
-    eom: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=1, offset=22)
-    )
+    eom = PackedField(width=1, offset=22)
 
     # Bit [23] - End of frame
-    eof: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=1, offset=23)
-    )
+    eof = PackedField(width=1, offset=23)
 
     # Bit [24] - Exclusive access
-    ex: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=1, offset=24)
-    )
+    ex = PackedField(width=1, offset=24)
 
     # Bits [26:25] - User bits (requests) or error code (responses)
-    u: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=2, offset=25)
-    )
+    u = PackedField(width=2, offset=25)
 
     # Bits [31:27] - Host ID
-    hostid: BitField = dataclasses.field(
-        default_factory=lambda: BitField(value=0, width=5, offset=27)
-    )
+    hostid = PackedField(width=5, offset=27)
+
+    FIELDS = ("cmd_type", "size", "len", "qos", "prot", "eom", "eof", "ex", "u", "hostid")
+    _WIDTH = 32
+
+    def __init__(self, **kwargs):
+        self._raw = 0
+        for name, value in kwargs.items():
+            if name not in self.FIELDS:
+                raise TypeError(f"Field '{name}' not found in {type(self)}")
+            setattr(self, name, value)
+
+    @classmethod
+    def from_int(cls, value):
+        c = cls.__new__(cls)
+        c._raw = int(value) & ((1 << cls._WIDTH) - 1)
+        return c
+
+    @classmethod
+    def from_bytes(cls, value):
+        return cls.from_int(int.from_bytes(value, byteorder='little'))
+
+    @classmethod
+    def from_fields(cls, **kwargs):
+        return cls(**kwargs)
+
+    def as_bit_field(self):
+        return BitField(value=self._raw, width=self._WIDTH, offset=0)
+
+    def __int__(self):
+        return self._raw
+
+    def __bytes__(self):
+        return self._raw.to_bytes(4, byteorder='little')
+
+    def __eq__(self, other):
+        if isinstance(other, SumiCmd):
+            return self._raw == other._raw
+        return NotImplemented
+
+    __hash__ = None
 
     @property
     def opcode(self) -> int:
         """Alias for cmd_type field."""
-        return int(self.cmd_type)
+        return self.cmd_type
 
     @property
     def atype(self) -> int:
         """Get ATYPE field (alias for len, used in atomic operations)."""
-        return int(self.len)
+        return self.len
 
     @atype.setter
     def atype(self, value: int):
         """Set ATYPE field (alias for len, used in atomic operations)."""
-        self.len.from_int(value)
+        self.len = value
 
     @property
     def err(self) -> int:
         """Get ERR field (alias for u, used in responses)."""
-        return int(self.u)
+        return self.u
 
     @err.setter
     def err(self, value: int):
         """Set ERR field (alias for u, used in responses)."""
-        self.u.from_int(value)
+        self.u = value
 
     def bytes_per_word(self) -> int:
         """Return the number of bytes per word based on SIZE field."""
-        return 1 << int(self.size)
+        return 1 << self.size
 
     def transfer_count(self) -> int:
         """Return the number of word transfers (LEN+1)."""
-        return int(self.len) + 1
+        return self.len + 1
 
     def total_bytes(self) -> int:
         """Return the total number of bytes in the transaction."""
-        return self.bytes_per_word() * self.transfer_count()
+        return (self.len + 1) << self.size
+
+    def clone(self) -> 'SumiCmd':
+        """Return an independent copy of this command."""
+        return SumiCmd.from_int(self._raw)
 
     def is_request(self) -> bool:
         """Check if this command is a request."""
-        return SumiCmdType.is_request(int(self.cmd_type))
+        return _IS_REQ[self.cmd_type]
 
     def is_response(self) -> bool:
         """Check if this command is a response."""
-        return SumiCmdType.is_response(int(self.cmd_type))
+        return _IS_RESP[self.cmd_type]
 
     def has_data(self) -> bool:
         """Check if this command carries data."""
-        return SumiCmdType.has_data(int(self.cmd_type))
+        return _HAS_DATA[self.cmd_type]
 
     def has_source_addr(self) -> bool:
         """Check if this command includes source address."""
-        return SumiCmdType.has_source_addr(int(self.cmd_type))
+        return _HAS_SA[self.cmd_type]
 
     def __repr__(self):
-        return f"SumiCmd({super().__repr__()})"
+        fields = "".join(f"{name} = {getattr(self, name)} " for name in self.FIELDS)
+        return f"SumiCmd({fields})"
 
 
 class SumiTransaction:
 
+    # Packed header layout (cmd, da, sa) for the common 64 bit address width
+    _HDR_STRUCT_64 = struct.Struct('<IQQ')
+
     def __init__(
         self,
-        cmd: SumiCmd,
+        cmd: Optional[SumiCmd],
         da: Optional[int],
         sa: Optional[int],
         data: Optional[bytes],
         addr_width: int = 64
     ):
-        self.cmd = copy.deepcopy(cmd)
+        self.cmd = cmd.clone() if cmd is not None else SumiCmd()
         self.da = BitField(value=da, width=addr_width, offset=0)
         self.sa = BitField(value=sa, width=addr_width, offset=0)
         self.data = data
         self._addr_width = addr_width
 
+    @classmethod
+    def with_lazy_data(
+        cls,
+        cmd: Optional[SumiCmd],
+        da: Optional[int],
+        sa: Optional[int],
+        data_loader: Optional[Callable[[], Optional[bytes]]],
+        addr_width: int = 64
+    ) -> 'SumiTransaction':
+        """Create a transaction whose data is produced by data_loader on first access."""
+        trans = cls(cmd=cmd, da=da, sa=sa, data=None, addr_width=addr_width)
+        trans._data_loader = data_loader
+        return trans
+
+    @property
+    def data(self) -> Optional[bytes]:
+        if self._data_loader is not None:
+            self._data = self._data_loader()
+            self._data_loader = None
+        return self._data
+
+    @data.setter
+    def data(self, value: Optional[bytes]):
+        self._data = value
+        self._data_loader = None
+
     def header_to_bytes(self) -> bytes:
+        if self._addr_width == 64:
+            return self._HDR_STRUCT_64.pack(int(self.cmd), int(self.da), int(self.sa))
         return (bytes(self.cmd)
                 + int.to_bytes(int(self.da), length=self._addr_width//8, byteorder='little')
                 + int.to_bytes(int(self.sa), length=self._addr_width//8, byteorder='little'))
 
     def to_lumi(self, lumi_size, inc_header=True, override_last=None):
-        raw = self.data[:(int(self.cmd.len)+1 << int(self.cmd.size))]
+        raw = self.data[:self.cmd.total_bytes()]
         if inc_header:
             raw = self.header_to_bytes() + raw
-        # Break raw into LUMI bus sized chunks
-        chunks = [raw[i:i+lumi_size] for i in range(0, len(raw), lumi_size)]
-        # Zero pad last chunk
-        chunks[-1] = chunks[-1] + bytes([0] * (lumi_size - len(chunks[-1])))
+        n = len(raw)
+        nchunks, rem = divmod(n, lumi_size)
+        if rem:
+            # Zero pad raw up to a whole number of chunks
+            nchunks += 1
+            raw = raw + bytes(lumi_size - rem)
+        raw_view = memoryview(raw)
         vrd_transactions = []
-        for i, chunk in enumerate(chunks):
-            # Set last true for the last chunk
-            last = (i == len(chunks)-1)
-            # Allow user to override last (useful for simulating streaming mode)
-            if last and (override_last is not None):
-                last = override_last
+        # Break raw into LUMI bus sized chunks
+        for start in range(0, nchunks * lumi_size, lumi_size):
             # Convert data to a valid ready transaction type
             vrd_transactions.append(VRDTransaction(
-                data=chunk,
-                last=last
+                data=bytes(raw_view[start:start + lumi_size]),
+                last=False
             ))
+        if vrd_transactions:
+            # Set last for the last chunk, allowing the user to override it
+            # (useful for simulating streaming mode)
+            vrd_transactions[-1].last = True if override_last is None else override_last
         return vrd_transactions
 
     def trunc_and_pad_zeros(self):
-        data_len = ((int(self.cmd.len)+1) << int(self.cmd.size))
-        self.data = bytes([0] * (len(self.data) - data_len)) + self.data[:data_len]
+        data_len = self.cmd.total_bytes()
+        self.data = bytes(max(len(self.data) - data_len, 0)) + self.data[:data_len]
 
     def __eq__(self, other):
         if isinstance(other, SumiTransaction):
@@ -324,9 +416,10 @@ class SumiTransaction:
                 if int(self.cmd.cmd_type) == SumiCmdType.UMI_RESP_WRITE:
                     return int(self.da) == int(other.da)
                 else:
-                    my_pkt = self.header_to_bytes() + self.data
-                    other_pkt = other.header_to_bytes() + other.data
-                    return my_pkt == other_pkt
+                    # Compare remaining header fields then data, without packing
+                    return (int(self.da) == int(other.da)
+                            and int(self.sa) == int(other.sa)
+                            and self.data == other.data)
             return False
         else:
             return False
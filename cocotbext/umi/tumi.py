@@ -38,9 +38,9 @@ class TumiTransaction:
 
             group_len = int(group_len / (2**sumi_size))
 
-            self._cmd.size.from_int(sumi_size)
-            self._cmd.len.from_int(group_len-1)
-            self._cmd.eom.from_int(1 if idx == len(data_grouped)-1 else 0)
+            self._cmd.size = sumi_size
+            self._cmd.len = group_len-1
+            self._cmd.eom = 1 if idx == len(data_grouped)-1 else 0
 
             trans = SumiTransaction(
                 cmd=self._cmd,
@@ -50,6 +50,7 @@ class TumiTransaction:
                 addr_width=addr_width
             )
             rtn.append(trans)
-            da += (int(self._cmd.len) + 1) << int(self._cmd.size)
-            sa += (int(self._cmd.len) + 1) << int(self._cmd.size)
+            nbytes = self._cmd.total_bytes()
+            da += nbytes
+            sa += nbytes
         return rtn
@@ -47,6 +47,51 @@ class BitField:
             return NotImplemented
 
 
+class PackedField:
+    """
+    Descriptor exposing a bit range of the integer held in the owner's _raw attribute.
+
+    Reads return a plain int, assignments are range checked and written back in place.
+    """
+
+    def __init__(self, width, offset=0):
+        self._width = width
+        self._offset = offset
+        self._mask = (1 << width) - 1
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return (obj._raw >> self._offset) & self._mask
+
+    def __set__(self, obj, value):
+        value = int(value)
+        if value < 0 or value > self._mask:
+            raise ValueError(
+                f"Value '{value}' out of range for field '{self._name}' of width {self._width}"
+            )
+        obj._raw = (obj._raw & ~(self._mask << self._offset)) | (value << self._offset)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def msb_idx(self):
+        return self._offset + self._width
+
+    @property
+    def lsb_idx(self):
+        return self._offset
+
+
 class BitVector:
 
     def as_bit_field(self):
@@ -1,18 +1,32 @@
+import itertools
 import math
 import random
 
 
-def random_toggle_generator(on_range=(0, 15), off_range=(0, 15)):
+def _random_batch_generator(lo, hi, batch):
+    # Draw values in batches to amortize the per-call RNG overhead
+    population = range(lo, hi + 1)
+    while True:
+        yield from random.choices(population, k=batch)
+
+
+def random_toggle_generator(on_range=(0, 15), off_range=(0, 15), batch=1024):
+    if batch < 1:
+        raise ValueError(f"batch must be at least 1, got {batch}")
     return bit_toggler_generator(
-        gen_on=(random.randint(*on_range) for _ in iter(int, 1)),
-        gen_off=(random.randint(*off_range) for _ in iter(int, 1))
+        gen_on=_random_batch_generator(*on_range, batch),
+        gen_off=_random_batch_generator(*off_range, batch)
     )
 
 
+def _sine_table(amplitude, w, offset=0):
+    # One period of the wave
+    return [amplitude * math.sin(2 * math.pi * (i / float(w))) + offset
+            for i in range(int(w))]
+
+
 def sine_wave_generator(amplitude, w, offset=0):
-    while True:
-        for idx in (i / float(w) for i in range(int(w))):
-            yield amplitude * math.sin(2 * math.pi * idx) + offset
+    return itertools.cycle(_sine_table(amplitude, w, offset))
 
 
 def bit_toggler_generator(gen_on, gen_off):
@@ -21,5 +35,7 @@ def bit_toggler_generator(gen_on, gen_off):
 
 
 def wave_generator(on_ampl=30, on_freq=200, off_ampl=10, off_freq=100):
-    return bit_toggler_generator(sine_wave_generator(on_ampl, on_freq),
-                                 sine_wave_generator(off_ampl, off_freq))
+    # Precompute one period of each wave as ints and repeat them independently
+    on = [int(abs(n)) for n in _sine_table(on_ampl, on_freq)]
+    off = [int(abs(n)) for n in _sine_table(off_ampl, off_freq)]
+    return zip(itertools.cycle(on), itertools.cycle(off))